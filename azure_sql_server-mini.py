@@ -1,29 +1,461 @@
+import io
 import os
+import base64
+import re
+import socket
+import string
 import json
+import time
+import asyncio
+import functools
+import inspect
+import logging
+import threading
+import types
 from typing import Any, Optional
 from contextlib import asynccontextmanager
-from collections.abc import AsyncIterator
-from dataclasses import dataclass
-
-from azure.identity import DefaultAzureCredential, ClientSecretCredential
-from azure.mgmt.sql import SqlManagementClient
-from azure.mgmt.resource import ResourceManagementClient
-from azure.core.exceptions import ResourceNotFoundError
-from azure.mgmt.sql.models import CheckNameAvailabilityRequest
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
+from dataclasses import dataclass, field
+
+import aiohttp
+import orjson
+from azure.identity import TokenCachePersistenceOptions
+from azure.identity.aio import DefaultAzureCredential, ClientSecretCredential
+from azure.mgmt.sql.aio import SqlManagementClient
+from azure.mgmt.resource.resources.aio import ResourceManagementClient
+from azure.core.async_paging import AsyncItemPaged
+from azure.core.polling import AsyncLROPoller
+from azure.core.exceptions import HttpResponseError, ResourceNotFoundError
+from azure.core.pipeline.policies import AsyncRetryPolicy, RequestIdPolicy
+from azure.core.pipeline.transport import AioHttpTransport
+from azure.mgmt.core import AsyncARMPipelineClient
+from azure.mgmt.core.policies import AsyncARMChallengeAuthenticationPolicy
+from azure.mgmt.core.polling.async_arm_polling import AsyncARMPolling
+from azure.mgmt.sql.models import CheckNameAvailabilityRequest, Database
 from mcp.server.fastmcp import FastMCP
+from tenacity import retry, retry_if_exception, stop_after_attempt, wait_exponential
 import dotenv
 
 # Load environment variables from .env file if it exists
 dotenv.load_dotenv()
 
+logging.basicConfig(level=os.getenv("LOG_LEVEL", "INFO").upper(), format="%(asctime)s %(levelname)s %(message)s")
+# azure-core's HTTP logging policy logs request URLs and headers at INFO
+logging.getLogger("azure").setLevel(logging.WARNING)
+logger = logging.getLogger(__name__)
+
+# TTLs (seconds) for cached ARM lookups
+LIST_CACHE_TTL = 60
+SERVER_CACHE_TTL = 300
+CACHE_MAXSIZE = 256
+
+# HTTP connection pool settings. Keep-alive probes start well before the
+# Azure load balancer's 240s idle timeout resets pooled connections.
+HTTP_POOL_SIZE = 50
+HTTP_KEEPALIVE_TIMEOUT = 120
+TCP_KEEPALIVE_IDLE = 120
+
+# Retry policy for Azure SDK clients
+SDK_RETRY_OPTIONS = {
+    "retry_total": 3,
+    "retry_backoff_factor": 0.5,
+    "retry_on_status_codes": [429, 502, 503, 504],
+}
+
+# Name of the persistent token cache used for Service Principal tokens
+TOKEN_CACHE_NAME = "mcp-azsql"
+
+# ARM batch endpoint settings
+ARM_ENDPOINT = "https://management.azure.com"
+ARM_SCOPE = "https://management.azure.com/.default"
+ARM_BATCH_API_VERSION = "2020-06-01"
+ARM_BATCH_LIMIT = 20
+ARM_BATCH_MAX_WAIT = 120
+# Same api-version azure-mgmt-sql uses for databases.list_by_server
+SQL_API_VERSION = "2021-02-01-preview"
+
+# Fan-out settings for cross-server requests
+FANOUT_LIMIT = 10
+THROTTLED_STATUS_CODES = (429, 503)
+BULK_CREATE_LIMIT = 5
+
+# Extracts the resource group name from an ARM resource ID
+RESOURCE_GROUP_RE = re.compile(r"/resourceGroups/([^/]+)", re.IGNORECASE)
+
+# ARM error codes returned when a server name is already taken
+NAME_CONFLICT_CODES = frozenset({"NameAlreadyExists", "NameAlreadyInUse", "PreconditionFailed"})
+
+# Per-record output templates for the list tools
+RESOURCE_GROUP_TEMPLATE = "Name: {name}\nLocation: {location}\nTags: {tags}\n" + "-" * 30
+# Placeholders match the Server model's attribute names so records can be
+# formatted straight from the model with format_map
+SERVER_TEMPLATE = (
+    "Name: {name}\nLocation: {location}\nResource Group: {resource_group}\n"
+    "State: {state}\nVersion: {version}\nAdmin Login: {administrator_login}\n"
+    "Fully Qualified Domain Name: {fully_qualified_domain_name}\n" + "-" * 50
+)
+DATABASE_TEMPLATE = (
+    "Name: {name}\nStatus: {status}\nEdition: {edition}\nService Objective: {service_objective}\n"
+    "Max Size: {max_size}\nCreation Date: {creation_date}\n" + "-" * 30
+)
+CREATE_RESULT_TEMPLATE = "Name: {name}\nServer: {server_name}\nStatus: {status}\n" + "-" * 30
+
+# Success messages for the create tools
+SERVER_CREATED_TEMPLATE = string.Template("""SQL Server created successfully!
+                    Name: $name
+                    Location: $location
+                    State: $state
+                    FQDN: $fqdn
+                    Admin Login: $admin_login
+
+                    Next steps:
+                    1. Configure firewall rules to allow connections
+                    2. Create databases on this server""")
+DATABASE_CREATED_TEMPLATE = string.Template("""Database created successfully!
+                Name: $name
+                Location: $location
+                Edition: $edition
+                Service Objective: $service_objective
+                Status: $status
+                Creation Date: $creation_date
+
+                Connection string format:
+                Server=${server_name}.database.windows.net;Database=${database_name};""")
+
+# Suggested (edition, service objective) per (expected_load, data_size)
+DATABASE_SUGGESTIONS = types.MappingProxyType({
+    ("low", "small"): ("Basic", "Basic"),
+    ("low", "medium"): ("Standard", "S1"),
+    ("medium", "medium"): ("Standard", "S2"),
+    ("high", "large"): ("Premium", "P1"),
+})
+DEFAULT_DATABASE_SUGGESTION = ("Standard", "S1")
+
+DATABASE_PROMPT_TEMPLATE = """
+            I need to create an Azure SQL database for: {purpose}
+
+            Based on your requirements:
+            - Expected load: {expected_load}
+            - Data size: {data_size}
+
+            Recommended configuration:
+            - Edition: {edition}
+            - Service Objective: {service_objective}
+
+            Steps to create:
+            1. Ensure you have a resource group
+            2. Create or use an existing SQL server
+            3. Create the database with recommended settings
+            4. Configure firewall rules for access
+            5. Set up connection strings
+            """
+
 # Ensure required environment variables are set
-@dataclass
+@dataclass(slots=True)
 class AzureContext:
     """Azure management context"""
     sql_client: Optional[SqlManagementClient] = None
     resource_client: Optional[ResourceManagementClient] = None
     subscription_id: Optional[str] = None
     credential: Optional[Any] = None
+    http_session: Optional[aiohttp.ClientSession] = None
+    arm_client: Optional[AsyncARMPipelineClient] = None
+    pending_fetches: dict = field(default_factory=dict)
+
+
+# Cached ARM lookups, keyed by tuple: key -> (value, expiry). Finished values
+# are kept at module scope like the credential so every MCP session shares
+# them. In-flight fetches stay on their own AzureContext, since they run on
+# that session's clients and fail once it closes.
+_response_cache: OrderedDict = OrderedDict()
+# Bumped by _invalidate so fetches started before it do not store their result
+_cache_epoch = 0
+
+
+def _settle_cache_entry(azure_ctx: AzureContext, key: tuple, ttl: float, epoch: int, task: asyncio.Future) -> None:
+    """Share a finished fetch's value for ttl seconds, unless it failed or was invalidated"""
+    if azure_ctx.pending_fetches.get(key, (None,))[0] is task:
+        del azure_ctx.pending_fetches[key]
+
+    if task.cancelled() or task.exception() is not None or epoch != _cache_epoch:
+        return
+
+    _response_cache[key] = (task.result(), time.monotonic() + ttl)
+    _response_cache.move_to_end(key)
+    if len(_response_cache) > CACHE_MAXSIZE:
+        _response_cache.popitem(last=False)
+
+
+async def _cached(azure_ctx: AzureContext, key: tuple, ttl: float, fetch: Callable[[], Awaitable[Any]]) -> Any:
+    """Return the cached value for key, calling fetch() on a miss or once the TTL expires"""
+    entry = _response_cache.get(key)
+    if entry is not None and entry[1] > time.monotonic():
+        _response_cache.move_to_end(key)
+        return entry[0]
+
+    # Concurrent misses in this session await one fetch
+    pending = azure_ctx.pending_fetches.get(key)
+    if pending is None or pending[1] != _cache_epoch:
+        task = asyncio.ensure_future(fetch())
+        pending = azure_ctx.pending_fetches[key] = (task, _cache_epoch)
+        task.add_done_callback(functools.partial(_settle_cache_entry, azure_ctx, key, ttl, _cache_epoch))
+
+    # Shield so one caller being cancelled does not cancel the shared fetch
+    return await asyncio.shield(pending[0])
+
+
+def _invalidate(*prefixes: tuple) -> None:
+    """Drop every cache entry whose key starts with one of the given prefixes"""
+    global _cache_epoch
+    _cache_epoch += 1
+    for key in [key for key in _response_cache if any(key[:len(p)] == p for p in prefixes)]:
+        del _response_cache[key]
+
+
+async def _get_server_location(azure_ctx: AzureContext, resource_group: str, server_name: str) -> str:
+    """Get a SQL server's location, cached per (resource_group, server_name)"""
+    async def fetch():
+        server = await azure_ctx.sql_client.servers.get(
+            resource_group_name=resource_group,
+            server_name=server_name
+        )
+        return server.location
+
+    return await _cached(azure_ctx, ("server_location", resource_group, server_name), SERVER_CACHE_TTL, fetch)
+
+
+async def _list_servers(azure_ctx: AzureContext, resource_group: Optional[str] = None) -> list:
+    """List SQL servers in the subscription or a resource group, cached for LIST_CACHE_TTL"""
+    async def fetch():
+        if resource_group:
+            return [s async for s in azure_ctx.sql_client.servers.list_by_resource_group(resource_group)]
+        return [s async for s in azure_ctx.sql_client.servers.list()]
+
+    return await _cached(azure_ctx, ("servers", resource_group), LIST_CACHE_TTL, fetch)
+
+
+async def _render_pages(items: AsyncItemPaged, render: Callable[[Any], str]) -> str:
+    """Render paged results into one buffer as each page arrives, without keeping the models"""
+    buffer = io.StringIO()
+    async for page in items.by_page():
+        async for item in page:
+            if buffer.tell():
+                buffer.write("\n")
+            buffer.write(render(item))
+    return buffer.getvalue()
+
+
+async def _render_page(
+    items: AsyncItemPaged,
+    render: Callable[[Any], str],
+    continuation_token: Optional[str] = None
+) -> tuple[str, Optional[str]]:
+    """Render a single page of results, returning it with the token for the next page"""
+    pages = items.by_page(continuation_token=continuation_token)
+    page = await anext(pages, None)
+    body = "\n".join([render(item) async for item in page]) if page else ""
+    return body, pages.continuation_token
+
+
+def _with_next_page(text: str, next_page_token: Optional[str]) -> str:
+    """Append the next page token, if any, to a listing"""
+    if not next_page_token:
+        return text
+    return f"{text}\n\nNext page token: {next_page_token}"
+
+
+def _format_resource_group(rg: Any) -> str:
+    """Format a single resource group for tool output"""
+    return RESOURCE_GROUP_TEMPLATE.format(name=rg.name, location=rg.location, tags=rg.tags or "None")
+
+
+def _format_server(server: Any) -> str:
+    """Format a single SQL server for tool output"""
+    return SERVER_TEMPLATE.format_map({**server.__dict__, "resource_group": RESOURCE_GROUP_RE.search(server.id).group(1)})
+
+
+def _format_database(db: Any) -> str:
+    """Format a single database for tool output"""
+    return DATABASE_TEMPLATE.format(
+        name=db.name,
+        status=db.status,
+        edition=db.sku.tier if db.sku else "N/A",
+        service_objective=db.sku.name if db.sku else (db.current_service_objective_name or "N/A"),
+        max_size=db.max_size_bytes or "N/A",
+        creation_date=db.creation_date or "N/A"
+    )
+
+
+def _databases_section(server_name: str, body: str) -> str:
+    """Wrap a server's formatted databases with the section header"""
+    if not body:
+        return f"No databases found on server '{server_name}'."
+
+    return f"DATABASES ON {server_name}\n{'=' * 50}\n{body}"
+
+
+async def _bounded_gather(coros: Iterable[Awaitable[Any]], limit: int = FANOUT_LIMIT) -> list:
+    """Await the coroutines concurrently, running at most `limit` of them at a time"""
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(coro):
+        async with semaphore:
+            return await coro
+
+    return await asyncio.gather(*(run(coro) for coro in coros))
+
+
+def _is_throttled(exc: BaseException) -> bool:
+    """Check whether an ARM call failed with a retryable throttling/unavailable status"""
+    if isinstance(exc, HttpResponseError):
+        return exc.status_code in THROTTLED_STATUS_CODES
+    if isinstance(exc, aiohttp.ClientResponseError):
+        return exc.status in THROTTLED_STATUS_CODES
+    return False
+
+
+def _is_arm_url(url: Optional[str]) -> bool:
+    """Check that a URL points at the ARM endpoint, so it is safe to send the bearer token to"""
+    return isinstance(url, str) and url.startswith(f"{ARM_ENDPOINT}/")
+
+
+def _operation_urls(operation: str) -> list[str]:
+    """Collect every URL an ARM poller would call for a continuation token"""
+    token = json.loads(base64.b64decode(operation))
+    if not isinstance(token, dict) or token.get("version") != 1:
+        raise ValueError("Unsupported operation token")
+
+    data = token["data"]
+    headers = {name.lower(): value for name, value in data["response"]["headers"].items()}
+    urls = [data["request"]["url"]]
+    urls.extend(headers[name] for name in ("azure-asyncoperation", "operation-location", "location") if name in headers)
+    return urls
+
+
+@retry(
+    retry=retry_if_exception(_is_throttled),
+    wait=wait_exponential(multiplier=1, max=30),
+    stop=stop_after_attempt(3),
+    reraise=True
+)
+async def arm_batch(azure_ctx: AzureContext, relative_urls: list[str]) -> list[dict]:
+    """
+    Run up to ARM_BATCH_LIMIT GET requests in a single ARM /batch round-trip
+
+    Args:
+        azure_ctx: Initialized Azure context
+        relative_urls: ARM paths including api-version (e.g. '/subscriptions/.../databases?api-version=...')
+
+    Returns:
+        The batch responses, in the same order as relative_urls
+    """
+    token = await azure_ctx.credential.get_token(ARM_SCOPE)
+    headers = {"Authorization": f"Bearer {token.token}"}
+    body = {
+        "requests": [
+            {"httpMethod": "GET", "relativeUrl": url, "name": str(i)}
+            for i, url in enumerate(relative_urls)
+        ]
+    }
+
+    async with azure_ctx.http_session.post(
+        f"{ARM_ENDPOINT}/batch?api-version={ARM_BATCH_API_VERSION}", json=body, headers=headers
+    ) as response:
+        response.raise_for_status()
+        status = response.status
+        location = response.headers.get("Location")
+        retry_after = int(response.headers.get("Retry-After", 1))
+        payload = await response.json() if status == 200 else None
+
+    # ARM answers 202 with a Location to poll while the batch is still running
+    deadline = time.monotonic() + ARM_BATCH_MAX_WAIT
+    while status == 202:
+        if not _is_arm_url(location):
+            raise ValueError("ARM batch response has no valid Location to poll")
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError(f"ARM batch did not complete within {ARM_BATCH_MAX_WAIT}s")
+        await asyncio.sleep(min(retry_after, remaining))
+        async with azure_ctx.http_session.get(location, headers=headers) as response:
+            response.raise_for_status()
+            status = response.status
+            location = response.headers.get("Location", location)
+            retry_after = int(response.headers.get("Retry-After", retry_after))
+            payload = await response.json() if status == 200 else None
+
+    return sorted(payload["responses"], key=lambda r: int(r["name"]))
+
+
+def with_ctx(fn: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Inject the lifespan AzureContext as the first argument of an MCP tool or resource
+
+    The wrapper's signature drops the azure_ctx parameter so FastMCP only exposes
+    the caller-supplied arguments.
+    """
+    signature = inspect.signature(fn)
+
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            return await fn(mcp.get_context().request_context.lifespan_context, *args, **kwargs)
+    else:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            return fn(mcp.get_context().request_context.lifespan_context, *args, **kwargs)
+
+    wrapper.__signature__ = signature.replace(parameters=list(signature.parameters.values())[1:])
+    return wrapper
+
+
+_credential_cache: Optional[Any] = None
+_credential_lock = threading.Lock()
+
+
+def get_credential() -> Any:
+    """Get the process-wide Azure credential, creating it on first use"""
+    global _credential_cache
+    
+    with _credential_lock:
+        if _credential_cache is not None:
+            return _credential_cache
+        
+        tenant_id = os.getenv("AZURE_TENANT_ID")
+        client_id = os.getenv("AZURE_CLIENT_ID")
+        client_secret = os.getenv("AZURE_CLIENT_SECRET")
+        
+        if tenant_id and client_id and client_secret:
+            # Service Principal authentication, with tokens persisted across restarts
+            _credential_cache = ClientSecretCredential(
+                tenant_id=tenant_id,
+                client_id=client_id,
+                client_secret=client_secret,
+                cache_persistence_options=TokenCachePersistenceOptions(
+                    name=TOKEN_CACHE_NAME,
+                    allow_unencrypted_storage=True
+                )
+            )
+            logger.info("Using Service Principal authentication")
+        else:
+            # Default credential (Managed Identity, Azure CLI, etc.)
+            _credential_cache = DefaultAzureCredential()
+            logger.info("Using Default Azure credential")
+        
+        return _credential_cache
+
+
+def _keepalive_socket(addr_info: tuple) -> socket.socket:
+    """Create a client socket with TCP keep-alive probes enabled"""
+    family, sock_type, proto, _, _ = addr_info
+    sock = socket.socket(family=family, type=sock_type, proto=proto)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    if hasattr(socket, "TCP_KEEPIDLE"):
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, TCP_KEEPALIVE_IDLE)
+    elif hasattr(socket, "TCP_KEEPALIVE"):
+        # macOS spells the idle-time option TCP_KEEPALIVE
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_KEEPALIVE, TCP_KEEPALIVE_IDLE)
+    return sock
 
 
 @asynccontextmanager
@@ -33,51 +465,69 @@ async def azure_lifespan(server: FastMCP) -> AsyncIterator[AzureContext]:
     
     # Get Azure credentials and subscription
     subscription_id = os.getenv("AZURE_SUBSCRIPTION_ID")
-    tenant_id = os.getenv("AZURE_TENANT_ID")
-    client_id = os.getenv("AZURE_CLIENT_ID")
-    client_secret = os.getenv("AZURE_CLIENT_SECRET")
     
     if not subscription_id:
-        print("Warning: AZURE_SUBSCRIPTION_ID not set.")
+        logger.warning("AZURE_SUBSCRIPTION_ID not set.")
         yield context
         return
     
     try:
-        # Initialize credentials
-        if all([tenant_id, client_id, client_secret]):
-            # Service Principal authentication
-            context.credential = ClientSecretCredential(
-                tenant_id=tenant_id,
-                client_id=client_id,
-                client_secret=client_secret
+        # Shared HTTP session so every SDK call reuses pooled TLS connections
+        context.http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=HTTP_POOL_SIZE,
+                keepalive_timeout=HTTP_KEEPALIVE_TIMEOUT,
+                socket_factory=_keepalive_socket
             )
-            print("Using Service Principal authentication")
-        else:
-            # Default credential (Managed Identity, Azure CLI, etc.)
-            context.credential = DefaultAzureCredential()
-            print("Using Default Azure credential")
+        )
+
+        # Reuse the process-wide credential so cached tokens survive lifespan restarts
+        context.credential = get_credential()
         
         # Initialize clients
         context.subscription_id = subscription_id
         context.sql_client = SqlManagementClient(
             credential=context.credential,
-            subscription_id=subscription_id
+            subscription_id=subscription_id,
+            transport=AioHttpTransport(session=context.http_session, session_owner=False),
+            **SDK_RETRY_OPTIONS
         )
         context.resource_client = ResourceManagementClient(
             credential=context.credential,
-            subscription_id=subscription_id
+            subscription_id=subscription_id,
+            transport=AioHttpTransport(session=context.http_session, session_owner=False),
+            **SDK_RETRY_OPTIONS
+        )
+        # Plain ARM pipeline for resuming operations from a continuation token
+        context.arm_client = AsyncARMPipelineClient(
+            base_url=ARM_ENDPOINT,
+            policies=[
+                RequestIdPolicy(),
+                AsyncRetryPolicy(**SDK_RETRY_OPTIONS),
+                AsyncARMChallengeAuthenticationPolicy(context.credential, ARM_SCOPE)
+            ],
+            transport=AioHttpTransport(session=context.http_session, session_owner=False)
         )
         
-        print(f"Connected to Azure subscription: {subscription_id}")
+        logger.info("Connected to Azure subscription: %s", subscription_id, extra={"sub_id": subscription_id})
         
     except Exception as e:
-        print(f"Warning: Could not initialize Azure clients: {e}")
+        logger.warning("Could not initialize Azure clients: %s", e)
     
     try:
         yield context
     finally:
-        # Cleanup if needed
-        print("Azure client context closed")
+        # Close clients before the session they share; the credential is
+        # process-wide and stays open for the next lifespan
+        if context.sql_client:
+            await context.sql_client.close()
+        if context.resource_client:
+            await context.resource_client.close()
+        if context.arm_client:
+            await context.arm_client.close()
+        if context.http_session:
+            await context.http_session.close()
+        logger.info("Azure client context closed")
 
 
 # Create MCP server with Azure lifecycle management
@@ -87,43 +537,59 @@ mcp = FastMCP(
         "azure-identity", 
         "azure-mgmt-sql", 
         "azure-mgmt-resource",
-        "azure-core"
+        "azure-core",
+        "azure-mgmt-core",
+        "aiohttp",
+        "tenacity",
+        "orjson"
     ],
     lifespan=azure_lifespan
 )
 
 
 @mcp.tool()
-def list_resource_groups() -> str:
-    """List all resource groups in the subscription"""
-    # Get the Azure context from the lifespan context
-    ctx = mcp.get_context()
-    azure_ctx = ctx.request_context.lifespan_context
-
+@with_ctx
+async def list_resource_groups(
+    azure_ctx: AzureContext,
+    filter: Optional[str] = None,
+    top: int = 100,
+    skip_token: Optional[str] = None
+) -> str:
+    """
+    List resource groups in the subscription, one page at a time
+    
+    Args:
+        filter: Optional OData filter applied by ARM (e.g., "tagName eq 'Environment' and tagValue eq 'Dev'")
+        top: Maximum number of resource groups per page (default: 100)
+        skip_token: Next page token returned by a previous call
+    """
     if not azure_ctx.resource_client:
         return "Error: Azure client not initialized. Please check your credentials."
     
+    if skip_token and not _is_arm_url(skip_token):
+        return "Error: skip_token must be a next page token returned by a previous call."
+    
     try:
-        resource_groups = list(azure_ctx.resource_client.resource_groups.list())
+        async def fetch():
+            resource_groups = azure_ctx.resource_client.resource_groups.list(filter=filter, top=top)
+            return await _render_page(resource_groups, _format_resource_group, skip_token)
+
+        body, next_page_token = await _cached(
+            azure_ctx, ("list_resource_groups", filter, top, skip_token), LIST_CACHE_TTL, fetch
+        )
         
-        if not resource_groups:
+        if not body:
             return "No resource groups found in the subscription."
         
-        result = ["RESOURCE GROUPS", "=" * 50]
-        for rg in resource_groups:
-            result.append(f"Name: {rg.name}")
-            result.append(f"Location: {rg.location}")
-            result.append(f"Tags: {rg.tags or 'None'}")
-            result.append("-" * 30)
-        
-        return "\n".join(result)
+        return _with_next_page(f"RESOURCE GROUPS\n{'=' * 50}\n{body}", next_page_token)
         
     except Exception as e:
         return f"Failed to list resource groups: {str(e)}"
 
 
 @mcp.tool()
-def create_resource_group(name: str, location: str, tags: Optional[str] = None) -> str:
+@with_ctx
+async def create_resource_group(azure_ctx: AzureContext, name: str, location: str, tags: Optional[str] = None) -> str:
     """
     Create a new resource group
     
@@ -132,9 +598,6 @@ def create_resource_group(name: str, location: str, tags: Optional[str] = None)
         location: Azure region (e.g., 'East US', 'West Europe')
         tags: Optional tags as JSON string (e.g., '{"Environment": "Dev", "Project": "MyApp"}')
     """
-    ctx = mcp.get_context()
-    azure_ctx = ctx.request_context.lifespan_context
-    
     if not azure_ctx.resource_client:
         return "Error: Azure client not initialized. Please check your credentials."
     
@@ -143,8 +606,8 @@ def create_resource_group(name: str, location: str, tags: Optional[str] = None)
         tag_dict = {}
         if tags:
             try:
-                tag_dict = json.loads(tags)
-            except json.JSONDecodeError:
+                tag_dict = orjson.loads(tags)
+            except orjson.JSONDecodeError:
                 return "Error: Tags must be valid JSON format"
         
         # Create resource group
@@ -153,10 +616,11 @@ def create_resource_group(name: str, location: str, tags: Optional[str] = None)
             'tags': tag_dict
         }
         
-        result = azure_ctx.resource_client.resource_groups.create_or_update(
+        result = await azure_ctx.resource_client.resource_groups.create_or_update(
             resource_group_name=name,
             parameters=rg_params
         )
+        _invalidate(("list_resource_groups",))
         
         return f"Resource group '{name}' created successfully in {location}"
         
@@ -165,54 +629,59 @@ def create_resource_group(name: str, location: str, tags: Optional[str] = None)
 
 
 @mcp.tool()
-def list_sql_servers(resource_group: Optional[str] = None) -> str:
+@with_ctx
+async def list_sql_servers(
+    azure_ctx: AzureContext,
+    resource_group: Optional[str] = None,
+    skip_token: Optional[str] = None
+) -> str:
     """
-    List SQL servers in subscription or specific resource group
+    List SQL servers in subscription or specific resource group, one page at a time
     
     Args:
         resource_group: Optional resource group name to filter servers
+        skip_token: Next page token returned by a previous call
     """
-    ctx = mcp.get_context()
-    azure_ctx = ctx.request_context.lifespan_context
-    
     if not azure_ctx.sql_client:
         return "Error: Azure SQL client not initialized. Please check your credentials."
     
+    if skip_token and not _is_arm_url(skip_token):
+        return "Error: skip_token must be a next page token returned by a previous call."
+    
     try:
-        if resource_group:
-            servers = list(azure_ctx.sql_client.servers.list_by_resource_group(resource_group))
-        else:
-            servers = list(azure_ctx.sql_client.servers.list())
+        async def fetch():
+            if resource_group:
+                servers = azure_ctx.sql_client.servers.list_by_resource_group(resource_group)
+            else:
+                servers = azure_ctx.sql_client.servers.list()
+            return await _render_page(servers, _format_server, skip_token)
+
+        body, next_page_token = await _cached(
+            azure_ctx, ("list_sql_servers", resource_group, skip_token), LIST_CACHE_TTL, fetch
+        )
         
-        if not servers:
+        if not body:
             location_msg = f" in resource group '{resource_group}'" if resource_group else ""
             return f"No SQL servers found{location_msg}."
         
-        result = ["SQL SERVERS", "=" * 50]
-        for server in servers:
-            result.append(f"Name: {server.name}")
-            result.append(f"Location: {server.location}")
-            result.append(f"Resource Group: {server.id.split('/')[4]}")
-            result.append(f"State: {server.state}")
-            result.append(f"Version: {server.version}")
-            result.append(f"Admin Login: {server.administrator_login}")
-            result.append(f"Fully Qualified Domain Name: {server.fully_qualified_domain_name}")
-            result.append("-" * 50)
-        
-        return "\n".join(result)
+        return _with_next_page(f"SQL SERVERS\n{'=' * 50}\n{body}", next_page_token)
         
     except Exception as e:
         return f"Failed to list SQL servers: {str(e)}"
 
 
 @mcp.tool()
-def create_sql_server(
+@with_ctx
+async def create_sql_server(
+    azure_ctx: AzureContext,
     resource_group: str,
     server_name: str,
     location: str,
     admin_login: str,
     admin_password: str,
-    version: str = "12.0"
+    version: str = "12.0",
+    wait: bool = True,
+    check_availability: bool = True
 ) -> str:
     """
     Create a new Azure SQL Server
@@ -224,22 +693,25 @@ def create_sql_server(
         admin_login: Administrator login name.
         admin_password: Administrator password.
         version: SQL Server version (default: 12.0).
+        wait: Wait for provisioning to finish (default: True). When False, returns an
+            operation token immediately that can be checked with poll_operation.
+        check_availability: Run a name availability check before creating (default: True).
+            Skipping it saves a round-trip, but then only If-None-Match on the create
+            request stands between this call and updating an existing server.
     """
-    ctx = mcp.get_context()
-    azure_ctx = ctx.request_context.lifespan_context
-    
     if not azure_ctx.sql_client:
         return "Error: Azure SQL client not initialized. Please check your credentials."
     
     try:
-        # Check if server name is available
-        availability_request = CheckNameAvailabilityRequest(name=server_name, type="Microsoft.Sql/servers")
-        availability = azure_ctx.sql_client.servers.check_name_availability(
-            parameters=availability_request
-        )
-        
-        if not availability.available:
-            return f"Server name '{server_name}' is not available: {availability.message}"
+        if check_availability:
+            # Check if server name is available
+            availability_request = CheckNameAvailabilityRequest(name=server_name, type="Microsoft.Sql/servers")
+            availability = await azure_ctx.sql_client.servers.check_name_availability(
+                parameters=availability_request
+            )
+            
+            if not availability.available:
+                return f"Server name '{server_name}' is not available: {availability.message}"
         
         # Server parameters
         server_params = {
@@ -250,34 +722,47 @@ def create_sql_server(
         }
         
         # Create server (this is a long-running operation)
-        print(f"Creating SQL server '{server_name}'... This may take several minutes.")
+        logger.info("Creating SQL server '%s'... This may take several minutes.", server_name)
         
-        operation = azure_ctx.sql_client.servers.begin_create_or_update(
-            resource_group_name=resource_group,
-            server_name=server_name,
-            parameters=server_params
-        )
+        # If-None-Match asks ARM not to update an existing server. The poller is
+        # passed in explicitly so the header stays on the PUT; the SDK would
+        # otherwise forward it to every status and final GET.
+        try:
+            operation = await azure_ctx.sql_client.servers.begin_create_or_update(
+                resource_group_name=resource_group,
+                server_name=server_name,
+                parameters=server_params,
+                headers={"If-None-Match": "*"},
+                polling=AsyncARMPolling()
+            )
+        except HttpResponseError as e:
+            if e.error and e.error.code in NAME_CONFLICT_CODES:
+                return f"Server name '{server_name}' is not available: {e.error.message}"
+            raise
+        _invalidate(("servers",), ("list_sql_servers",))
         
-        # Wait for completion
-        server = operation.result()
+        if not wait:
+            return json.dumps({"status": "accepted", "operation": operation.continuation_token()})
         
-        return f"""SQL Server created successfully!
-                    Name: {server.name}
-                    Location: {server.location}
-                    State: {server.state}
-                    FQDN: {server.fully_qualified_domain_name}
-                    Admin Login: {server.administrator_login}
-
-                    Next steps:
-                    1. Configure firewall rules to allow connections
-                    2. Create databases on this server"""
+        # Wait for completion; listings cached while it ran predate the new server
+        server = await operation.result()
+        _invalidate(("servers",), ("list_sql_servers",))
+        
+        return SERVER_CREATED_TEMPLATE.substitute(
+            name=server.name,
+            location=server.location,
+            state=server.state,
+            fqdn=server.fully_qualified_domain_name,
+            admin_login=server.administrator_login
+        )
         
     except Exception as e:
         return f"Failed to create SQL server: {str(e)}"
 
 
 @mcp.tool()
-def list_databases(resource_group: str, server_name: str) -> str:
+@with_ctx
+async def list_databases(azure_ctx: AzureContext, resource_group: str, server_name: str) -> str:
     """
     List databases on a SQL server
     
@@ -285,44 +770,130 @@ def list_databases(resource_group: str, server_name: str) -> str:
         resource_group: Resource group name
         server_name: SQL server name
     """
-    ctx = mcp.get_context()
-    azure_ctx = ctx.request_context.lifespan_context
-    
     if not azure_ctx.sql_client:
         return "Error: Azure SQL client not initialized. Please check your credentials."
     
     try:
-        databases = list(azure_ctx.sql_client.databases.list_by_server(
-            resource_group_name=resource_group,
-            server_name=server_name
-        ))
-        
-        if not databases:
-            return f"No databases found on server '{server_name}'."
-        
-        result = [f"DATABASES ON {server_name}", "=" * 50]
-        for db in databases:
-            result.append(f"Name: {db.name}")
-            result.append(f"Status: {db.status}")
-            result.append(f"Edition: {db.sku.tier if db.sku else 'N/A'}")
-            result.append(f"Service Objective: {db.sku.name if db.sku else (db.current_service_objective_name or 'N/A')}")
-            result.append(f"Max Size: {db.max_size_bytes or 'N/A'}")
-            result.append(f"Creation Date: {db.creation_date or 'N/A'}")
-            result.append("-" * 30)
-        
-        return "\n".join(result)
+        async def fetch():
+            databases = azure_ctx.sql_client.databases.list_by_server(
+                resource_group_name=resource_group,
+                server_name=server_name
+            )
+            return await _render_pages(databases, _format_database)
+
+        body = await _cached(azure_ctx, ("list_databases", resource_group, server_name), LIST_CACHE_TTL, fetch)
         
+        return _databases_section(server_name, body)
+
+    except Exception as e:
+        return f"Failed to list databases: {str(e)}"
+
+
+@mcp.tool()
+@with_ctx
+async def list_all_databases_in_subscription(azure_ctx: AzureContext) -> str:
+    """List databases on every SQL server in the subscription using batched ARM requests"""
+    if not azure_ctx.sql_client:
+        return "Error: Azure SQL client not initialized. Please check your credentials."
+
+    try:
+        servers = await _list_servers(azure_ctx)
+
+        if not servers:
+            return "No SQL servers found."
+
+        databases = {server.id: [] for server in servers}
+        errors = {}
+
+        # Each round fetches one page per server; servers whose page had a
+        # nextLink go into the next round until every server is exhausted
+        pending = [(server, f"{server.id}/databases?api-version={SQL_API_VERSION}") for server in servers]
+        while pending:
+            chunks = [pending[start:start + ARM_BATCH_LIMIT] for start in range(0, len(pending), ARM_BATCH_LIMIT)]
+            batches = await _bounded_gather(
+                arm_batch(azure_ctx, [url for _, url in chunk]) for chunk in chunks
+            )
+
+            pending = []
+            for chunk, responses in zip(chunks, batches):
+                for (server, _), response in zip(chunk, responses):
+                    content = response.get("content") or {}
+                    if response.get("httpStatusCode") != 200:
+                        errors[server.id] = content.get("error", {}).get("message", "Unknown error")
+                        continue
+
+                    databases[server.id].extend(content.get("value", []))
+                    next_link = content.get("nextLink")
+                    if not next_link:
+                        continue
+                    if not _is_arm_url(next_link):
+                        errors[server.id] = f"Unexpected nextLink: {next_link}"
+                        continue
+                    pending.append((server, next_link[len(ARM_ENDPOINT):]))
+
+        sections = []
+        for server in servers:
+            if server.id in errors:
+                sections.append(f"Failed to list databases on server '{server.name}': {errors[server.id]}")
+                continue
+
+            body = "\n".join(_format_database(Database.deserialize(item)) for item in databases[server.id])
+            sections.append(_databases_section(server.name, body))
+
+        return "\n\n".join(sections)
+
     except Exception as e:
         return f"Failed to list databases: {str(e)}"
 
 
+async def _begin_create_database(
+    azure_ctx: AzureContext,
+    resource_group: str,
+    server_name: str,
+    database_name: str,
+    edition: str,
+    service_objective: str
+) -> AsyncLROPoller:
+    """Start creating a database in its server's location and return the poller"""
+    # Get the server's location
+    server_location = await _get_server_location(azure_ctx, resource_group, server_name)
+    
+    # Database parameters
+    db_params = {
+        'location': server_location,
+        'sku': {
+            'name': service_objective,
+            'tier': edition 
+        }
+    }
+    
+    logger.info(
+        "Creating database '%s' on server '%s' in location '%s'...",
+        database_name, server_name, server_location
+    )
+    
+    # Create database
+    operation = await azure_ctx.sql_client.databases.begin_create_or_update(
+        resource_group_name=resource_group,
+        server_name=server_name,
+        database_name=database_name,
+        parameters=db_params
+    )
+    _invalidate(("list_databases", resource_group, server_name))
+    
+    return operation
+
+
 @mcp.tool()
-def create_database(
+@with_ctx
+async def create_database(
+    azure_ctx: AzureContext,
     resource_group: str,
     server_name: str,
     database_name: str,
     edition: str = "Basic",
-    service_objective: str = "Basic"
+    service_objective: str = "Basic",
+    wait: bool = True
 ) -> str:
     """
     Create a new database on a SQL server
@@ -333,66 +904,133 @@ def create_database(
         database_name: Database name
         edition: Database edition (Basic, Standard, Premium, GeneralPurpose, BusinessCritical)
         service_objective: Service level objective (Basic, S0, S1, P1, GP_Gen5_2, etc.)
+        wait: Wait for provisioning to finish (default: True). When False, returns an
+            operation token immediately that can be checked with poll_operation.
     """
-    ctx = mcp.get_context()
-    azure_ctx = ctx.request_context.lifespan_context
-    
     if not azure_ctx.sql_client:
         return "Error: Azure SQL client not initialized. Please check your credentials."
     
     try:
-        # Get the server's location
-        server_details = azure_ctx.sql_client.servers.get(
-            resource_group_name=resource_group,
-            server_name=server_name
+        operation = await _begin_create_database(
+            azure_ctx, resource_group, server_name, database_name, edition, service_objective
         )
-        server_location = server_details.location
-        
-        # Database parameters
-        db_params = {
-            'location': server_location,
-            'sku': {
-                'name': service_objective,
-                'tier': edition 
-            }
-        }
         
-        print(f"Creating database '{database_name}' on server '{server_name}' in location '{server_location}'...")
+        if not wait:
+            return json.dumps({"status": "accepted", "operation": operation.continuation_token()})
         
-        # Create database
-        operation = azure_ctx.sql_client.databases.begin_create_or_update(
-            resource_group_name=resource_group,
+        # Wait for completion; listings cached while it ran predate the new database
+        database = await operation.result()
+        _invalidate(("list_databases", resource_group, server_name))
+        
+        return DATABASE_CREATED_TEMPLATE.substitute(
+            name=database.name,
+            location=database.location,
+            edition=getattr(database.sku, "tier", "N/A"),
+            service_objective=getattr(database.sku, "name", "N/A"),
+            status=database.status,
+            creation_date=database.creation_date,
             server_name=server_name,
-            database_name=database_name,
-            parameters=db_params
+            database_name=database_name
         )
         
-        # Wait for completion
-        database = operation.result()
-        
-        return f"""Database created successfully!
-                Name: {database.name}
-                Location: {database.location}
-                Edition: {database.sku.tier if database.sku else 'N/A'}
-                Service Objective: {database.sku.name if database.sku else 'N/A'}
-                Status: {database.status}
-                Creation Date: {database.creation_date}
-
-                Connection string format:
-                Server={server_name}.database.windows.net;Database={database_name};"""
-        
     except ResourceNotFoundError:
         return f"SQL Server '{server_name}' not found in resource group '{resource_group}'."
     except Exception as e:
         return f"Failed to create database: {str(e)}"
 
 
+@mcp.tool()
+@with_ctx
+async def create_databases(azure_ctx: AzureContext, specs: list[dict[str, str]]) -> str:
+    """
+    Create several databases concurrently
+    
+    Args:
+        specs: Databases to create, each with 'resource_group', 'server_name' and 'database_name',
+            and optionally 'edition' and 'service_objective' (both default to Basic)
+    """
+    if not azure_ctx.sql_client:
+        return "Error: Azure SQL client not initialized. Please check your credentials."
+    
+    if not specs:
+        return "Error: No databases specified."
+    
+    # Only the begin requests are throttled; the long provisioning waits all overlap
+    begin_limit = asyncio.Semaphore(BULK_CREATE_LIMIT)
+    
+    async def create(spec: dict[str, str]) -> tuple[str, str, str, bool]:
+        name = spec.get("database_name", "N/A")
+        server_name = spec.get("server_name", "N/A")
+        missing = [key for key in ("resource_group", "server_name", "database_name") if not spec.get(key)]
+        if missing:
+            return name, server_name, f"Failed: missing {', '.join(missing)}", False
+        
+        try:
+            async with begin_limit:
+                operation = await _begin_create_database(
+                    azure_ctx,
+                    spec["resource_group"],
+                    server_name,
+                    name,
+                    spec.get("edition", "Basic"),
+                    spec.get("service_objective", "Basic")
+                )
+            database = await operation.result()
+            _invalidate(("list_databases", spec["resource_group"], server_name))
+            return name, server_name, str(database.status), True
+        except ResourceNotFoundError:
+            return name, server_name, f"Failed: server not found in resource group '{spec['resource_group']}'", False
+        except Exception as e:
+            return name, server_name, f"Failed: {str(e)}", False
+    
+    # Provisioning takes minutes per database, so overlap the operations
+    results = await asyncio.gather(*(create(spec) for spec in specs))
+    
+    created = sum(1 for *_, ok in results if ok)
+    body = "\n".join(
+        CREATE_RESULT_TEMPLATE.format(name=name, server_name=server_name, status=status)
+        for name, server_name, status, _ in results
+    )
+    
+    return f"DATABASES CREATED ({created} of {len(results)})\n{'=' * 50}\n{body}"
+
+
+@mcp.tool()
+@with_ctx
+async def poll_operation(azure_ctx: AzureContext, operation: str) -> str:
+    """
+    Check the status of a long-running operation started with wait=False
+    
+    Args:
+        operation: Operation token returned by create_sql_server or create_database
+    """
+    if not azure_ctx.arm_client:
+        return "Error: Azure client not initialized. Please check your credentials."
+    
+    try:
+        # The poller sends the bearer token to these URLs, so they must all be ARM
+        if not all(_is_arm_url(url) for url in _operation_urls(operation)):
+            return f"Error: Operation does not point at {ARM_ENDPOINT}"
+
+        # Only the status is reported, so the poller needs no deserializer
+        poller = AsyncLROPoller.from_continuation_token(
+            polling_method=AsyncARMPolling(),
+            continuation_token=operation,
+            client=azure_ctx.arm_client,
+            deserialization_callback=lambda response: None
+        )
+        await poller.polling_method().update_status()
+        
+        return json.dumps({"status": poller.status()})
+        
+    except Exception as e:
+        return f"Failed to poll operation: {str(e)}"
+
+
 @mcp.resource("azure://subscription")
-def get_subscription_info() -> str:
+@with_ctx
+def get_subscription_info(azure_ctx: AzureContext) -> str:
     """Get Azure subscription information"""
-    ctx = mcp.get_context()
-    azure_ctx = ctx.request_context.lifespan_context
-    
     if not azure_ctx.subscription_id:
         return "No Azure subscription configured"
     
@@ -400,9 +1038,23 @@ def get_subscription_info() -> str:
 
 
 @mcp.resource("azure://servers")
-def get_all_servers() -> str:
+@with_ctx
+async def get_all_servers(azure_ctx: AzureContext) -> str:
     """Get all SQL servers as a resource"""
-    return list_sql_servers()
+    if not azure_ctx.sql_client:
+        return "Error: Azure SQL client not initialized. Please check your credentials."
+    
+    try:
+        # Resource readers cannot pass a page token, so list every page
+        servers = await _list_servers(azure_ctx)
+        if not servers:
+            return "No SQL servers found."
+        
+        body = "\n".join(_format_server(server) for server in servers)
+        return f"SQL SERVERS\n{'=' * 50}\n{body}"
+        
+    except Exception as e:
+        return f"Failed to list SQL servers: {str(e)}"
 
 
 @mcp.prompt()
@@ -419,37 +1071,18 @@ def database_creation_prompt(
         expected_load: Expected load (low, medium, high)
         data_size: Expected data size (small, medium, large)
     """
-    
     # Suggest editions and service objectives based on requirements
-    suggestions = {
-        ("low", "small"): ("Basic", "Basic"),
-        ("low", "medium"): ("Standard", "S1"),
-        ("medium", "medium"): ("Standard", "S2"),
-        ("high", "large"): ("Premium", "P1"),
-    }
-    
-    key = (expected_load.lower(), data_size.lower())
-    edition, service_obj = suggestions.get(key, ("Standard", "S1"))
+    edition, service_objective = DATABASE_SUGGESTIONS.get(
+        (expected_load.lower(), data_size.lower()), DEFAULT_DATABASE_SUGGESTION
+    )
     
-    return f"""
-            I need to create an Azure SQL database for: {purpose}
-
-            Based on your requirements:
-            - Expected load: {expected_load}
-            - Data size: {data_size}
-
-            Recommended configuration:
-            - Edition: {edition}
-            - Service Objective: {service_obj}
-
-            Steps to create:
-            1. Ensure you have a resource group
-            2. Create or use an existing SQL server
-            3. Create the database with recommended settings
-            4. Configure firewall rules for access
-            5. Set up connection strings
-            """
-
+    return DATABASE_PROMPT_TEMPLATE.format_map({
+        "purpose": purpose,
+        "expected_load": expected_load,
+        "data_size": data_size,
+        "edition": edition,
+        "service_objective": service_objective,
+    })
 
 if __name__ == "__main__":
     # Run the MCP server    